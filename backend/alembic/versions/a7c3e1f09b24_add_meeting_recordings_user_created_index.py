@@ -0,0 +1,31 @@
+"""add_meeting_recordings_user_created_index
+
+Revision ID: a7c3e1f09b24
+Revises: 5e9cd4f6e4bf
+Create Date: 2026-10-15 10:12:31.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e1f09b24'
+down_revision: Union[str, Sequence[str], None] = '5e9cd4f6e4bf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_meeting_recordings_user_id_created_at', 'meeting_recordings', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # InnoDB now backs the user_id foreign key with the composite index; give it
+    # a standalone index first or the drop fails with error 1553
+    op.create_index('ix_meeting_recordings_user_id', 'meeting_recordings', ['user_id'], unique=False)
+    op.drop_index('ix_meeting_recordings_user_id_created_at', table_name='meeting_recordings')
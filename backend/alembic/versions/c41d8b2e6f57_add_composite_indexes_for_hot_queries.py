@@ -0,0 +1,38 @@
+"""add_composite_indexes_for_hot_queries
+
+Revision ID: c41d8b2e6f57
+Revises: a7c3e1f09b24
+Create Date: 2026-10-15 11:03:52.207164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d8b2e6f57'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e1f09b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # InnoDB builds secondary indexes online, so these don't block writes
+    op.create_index('ix_call_participants_call_id_user_id', 'call_participants', ['call_id', 'user_id'], unique=False)
+    op.create_index('ix_user_connections_user_id_connected_user_id', 'user_connections', ['user_id', 'connected_user_id'], unique=False)
+    op.create_index('ix_user_connections_connected_user_id_user_id', 'user_connections', ['connected_user_id', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # InnoDB now backs each leading foreign key column with its composite index;
+    # give it a standalone index first or the drop fails with error 1553
+    op.create_index('ix_user_connections_connected_user_id', 'user_connections', ['connected_user_id'], unique=False)
+    op.drop_index('ix_user_connections_connected_user_id_user_id', table_name='user_connections')
+    op.create_index('ix_user_connections_user_id', 'user_connections', ['user_id'], unique=False)
+    op.drop_index('ix_user_connections_user_id_connected_user_id', table_name='user_connections')
+    op.create_index('ix_call_participants_call_id', 'call_participants', ['call_id'], unique=False)
+    op.drop_index('ix_call_participants_call_id_user_id', table_name='call_participants')
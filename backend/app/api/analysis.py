@@ -3,6 +3,7 @@ Analysis API routes
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.orm import Session
 from typing import Optional
 
@@ -132,12 +133,9 @@ async def save_transcript(
             detail="Call not found",
         )
 
-    transcript = db.query(Transcript).filter(Transcript.call_id == call_id).first()
-    if transcript:
-        transcript.content = content
-    else:
-        transcript = Transcript(call_id=call_id, content=content)
-        db.add(transcript)
-
+    # Single-statement upsert on the unique call_id
+    stmt = insert(Transcript).values(call_id=call_id, content=content)
+    stmt = stmt.on_duplicate_key_update(content=content)
+    db.execute(stmt)
     db.commit()
     return {"message": "Transcript saved"}
@@ -2,7 +2,7 @@
 Call API routes
 """
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
-import shutil
+import aiofiles
 from pathlib import Path
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
@@ -19,6 +19,8 @@ from app.websockets.connection_manager import manager
 
 router = APIRouter(prefix="/calls", tags=["calls"])
 
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
 
 class InitiateCallRequest(BaseModel):
     target_user_id: int  # Required: ID of the user to call
@@ -290,8 +292,9 @@ async def upload_recording(
     # Save file
     file_path = upload_dir / f"call_{call_id}_{file.filename}"
     try:
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await buffer.write(chunk)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save recording: {e}")
         
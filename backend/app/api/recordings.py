@@ -1,15 +1,19 @@
 """
 Recordings API routes for meeting recordings
 """
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
-import shutil
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, File, UploadFile, Query, Response
+from fastapi.responses import StreamingResponse
+import aiofiles
+import orjson
 from pathlib import Path
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only
 from typing import Optional, List
 from datetime import datetime
+from uuid import uuid4
 
-from app.db.session import get_db
+from app.db.session import get_db, SessionLocal
 from app.db.models import MeetingRecording, RecordingStatus
 from app.core.security import get_current_user, TokenPayload
 from app.services.transcription_service import transcription_service
@@ -20,6 +24,12 @@ from app.core.config import settings
 
 router = APIRouter(prefix="/recordings", tags=["recordings"])
 
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Created once at import rather than on every upload
+UPLOAD_DIR = Path("uploads/meetings")
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
 
 class RecordingResponse(BaseModel):
     id: int
@@ -35,6 +45,19 @@ class RecordingResponse(BaseModel):
         from_attributes = True
 
 
+class RecordingSummaryResponse(BaseModel):
+    """Recording fields for list views; transcript and analysis via the detail endpoint."""
+    id: int
+    filename: str
+    file_path: Optional[str]
+    duration_seconds: Optional[int]
+    status: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class AnalyzeRequest(BaseModel):
     user_interpretation: str
 
@@ -48,20 +71,18 @@ async def upload_recording(
     """Upload a meeting recording file."""
     user_id = int(current_user.sub)
     
-    # Ensure uploads directory exists
-    upload_dir = Path("uploads/meetings")
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Generate unique filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_filename = f"user_{user_id}_{timestamp}_{file.filename}"
-    file_path = upload_dir / safe_filename
+    # Generate unique filename; the original name is kept in the DB record
+    safe_filename = f"user_{user_id}_{uuid4().hex}{Path(file.filename or '').suffix}"
+    file_path = UPLOAD_DIR / safe_filename
     
-    # Save file
+    # Save file in chunks so the event loop is not blocked during the copy
+    # (the body size cap is enforced by ContentSizeLimitMiddleware)
     try:
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await buffer.write(chunk)
     except Exception as e:
+        file_path.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=f"Failed to save recording: {e}")
     
     # Create database record
@@ -78,16 +99,35 @@ async def upload_recording(
     return recording
 
 
-@router.get("/", response_model=List[RecordingResponse])
+@router.get("/", response_model=List[RecordingSummaryResponse])
 async def list_recordings(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
     current_user: TokenPayload = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """List all recordings for the current user."""
+    """List recordings for the current user, newest first."""
     user_id = int(current_user.sub)
-    recordings = db.query(MeetingRecording).filter(
+    total = db.query(func.count(MeetingRecording.id)).filter(
         MeetingRecording.user_id == user_id
-    ).order_by(MeetingRecording.created_at.desc()).all()
+    ).scalar()
+    response.headers["X-Total-Count"] = str(total)
+    
+    # Skip the large transcript/analysis TEXT columns in list views
+    recordings = db.query(MeetingRecording).options(
+        load_only(
+            MeetingRecording.id,
+            MeetingRecording.filename,
+            MeetingRecording.file_path,
+            MeetingRecording.duration_seconds,
+            MeetingRecording.status,
+            MeetingRecording.created_at,
+            raiseload=True,
+        )
+    ).filter(
+        MeetingRecording.user_id == user_id
+    ).order_by(MeetingRecording.created_at.desc()).offset(offset).limit(limit).all()
     return recordings
 
 
@@ -110,13 +150,48 @@ async def get_recording(
     return recording
 
 
+async def _transcribe_file(file_path: str) -> Optional[str]:
+    """Transcribe with the configured provider (local or ElevenLabs)."""
+    if settings.transcription_provider == "local":
+        return await local_transcription_service.transcribe_audio_file(file_path)
+    return await transcription_service.transcribe_audio_file(file_path)
+
+
+async def _transcribe_in_background(recording_id: int):
+    """Transcribe a recording after the response has been sent."""
+    db = SessionLocal()
+    try:
+        recording = db.query(MeetingRecording).filter(
+            MeetingRecording.id == recording_id
+        ).first()
+        if not recording:
+            return
+        
+        try:
+            recording.transcript = await _transcribe_file(recording.file_path)
+            recording.status = RecordingStatus.TRANSCRIBED
+        except Exception as e:
+            print(f"Background transcription failed for recording {recording_id}: {e}")
+            recording.status = RecordingStatus.FAILED
+        db.commit()
+    finally:
+        db.close()
+
+
 @router.post("/{recording_id}/transcribe", response_model=RecordingResponse)
 async def transcribe_recording(
     recording_id: int,
+    background_tasks: BackgroundTasks,
+    background: bool = Query(False),
     current_user: TokenPayload = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Transcribe a recording using ElevenLabs."""
+    """
+    Transcribe a recording.
+    
+    With background=true the request returns immediately with status
+    "transcribing"; poll GET /recordings/{id} for the result.
+    """
     user_id = int(current_user.sub)
     recording = db.query(MeetingRecording).filter(
         MeetingRecording.id == recording_id,
@@ -133,12 +208,13 @@ async def transcribe_recording(
     recording.status = RecordingStatus.TRANSCRIBING
     db.commit()
     
+    if background:
+        background_tasks.add_task(_transcribe_in_background, recording.id)
+        db.refresh(recording)
+        return recording
+    
     try:
-        # Use local or ElevenLabs based on config
-        if settings.transcription_provider == "local":
-            transcript = await local_transcription_service.transcribe_audio_file(recording.file_path)
-        else:
-            transcript = await transcription_service.transcribe_audio_file(recording.file_path)
+        transcript = await _transcribe_file(recording.file_path)
         recording.transcript = transcript
         recording.status = RecordingStatus.TRANSCRIBED
         db.commit()
@@ -150,6 +226,77 @@ async def transcribe_recording(
         raise HTTPException(status_code=500, detail=f"Transcription failed: {e}")
 
 
+def _save_streamed_transcript(recording_id: int, parts: List[str], status_value: RecordingStatus):
+    """Persist the outcome of a streamed transcription."""
+    # The request-scoped session is closed by now; use a fresh one
+    db = SessionLocal()
+    try:
+        recording = db.query(MeetingRecording).filter(
+            MeetingRecording.id == recording_id
+        ).first()
+        if recording:
+            if parts:
+                recording.transcript = " ".join(parts)
+            recording.status = status_value
+            db.commit()
+    finally:
+        db.close()
+
+
+@router.post("/{recording_id}/transcribe/stream")
+async def stream_transcription(
+    recording_id: int,
+    current_user: TokenPayload = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Transcribe a recording, streaming segments as Server-Sent Events.
+    
+    Each segment is sent as a `data: {"text": ...}` event; a final `done`
+    event carries the recording status once the transcript is saved.
+    """
+    user_id = int(current_user.sub)
+    recording = db.query(MeetingRecording).filter(
+        MeetingRecording.id == recording_id,
+        MeetingRecording.user_id == user_id,
+    ).first()
+    
+    if not recording:
+        raise HTTPException(status_code=404, detail="Recording not found")
+    
+    if not recording.file_path:
+        raise HTTPException(status_code=400, detail="Recording file not found")
+    
+    recording.status = RecordingStatus.TRANSCRIBING
+    db.commit()
+    file_path = recording.file_path
+    
+    async def event_stream():
+        parts = []
+        status_value = RecordingStatus.FAILED
+        try:
+            try:
+                if settings.transcription_provider == "local":
+                    async for text in local_transcription_service.stream_audio_file(file_path):
+                        parts.append(text)
+                        yield f"data: {orjson.dumps({'text': text}).decode()}\n\n"
+                else:
+                    text = await transcription_service.transcribe_audio_file(file_path)
+                    parts.append(text or "")
+                    yield f"data: {orjson.dumps({'text': text}).decode()}\n\n"
+                status_value = RecordingStatus.TRANSCRIBED
+            except Exception as e:
+                print(f"Streaming transcription failed for recording {recording_id}: {e}")
+        finally:
+            # Also runs when the client disconnects and the stream is cancelled,
+            # so the recording never stays "transcribing"; partial text is kept
+            _save_streamed_transcript(recording_id, parts, status_value)
+        
+        yield f"event: done\ndata: {orjson.dumps({'status': status_value.value}).decode()}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.post("/{recording_id}/analyze", response_model=RecordingResponse)
 async def analyze_recording(
     recording_id: int,
@@ -30,6 +30,18 @@ class Settings(BaseSettings):
     # Transcription provider: "local" or "elevenlabs"
     transcription_provider: str = "local"
     
+    # Local Whisper (faster-whisper / CTranslate2)
+    # Model size name or path to a pre-converted CTranslate2 model directory
+    whisper_model: str = "base"
+    whisper_compute_type: str = "int8"
+    whisper_cpu_threads: int = 0  # per process; 0 uses all available cores
+    whisper_num_workers: int = 1
+    whisper_beam_size: int = 1  # 1 = greedy decoding; raise for accuracy-critical jobs
+    whisper_batch_size: int = 8  # VAD chunks per batched decode; 1 disables batching
+    
+    # Uploads
+    max_upload_bytes: int = 500 * 1024 * 1024  # 500 MiB
+    
     # OpenRouter
     openrouter_api_key: Optional[str] = None
 
@@ -0,0 +1,70 @@
+"""
+ASGI middleware
+"""
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ContentSizeLimitMiddleware:
+    """Reject request bodies larger than a limit before they are buffered.
+
+    Requests that declare too large a Content-Length get a 413 straight away,
+    and streamed (chunked) bodies without a Content-Length get a 411. The
+    body is also counted as it arrives, so a request can never push more
+    than the limit into the application.
+    """
+
+    def __init__(self, app: ASGIApp, max_content_size: int):
+        self.app = app
+        self.max_content_size = max_content_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_length = headers.get("content-length")
+        if content_length is None and "transfer-encoding" in headers:
+            await self._reject(411, "Content-Length header required", scope, receive, send)
+            return
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) > self.max_content_size:
+                await self._reject(413, "Request body too large", scope, receive, send)
+                return
+
+        received = 0
+        response_started = False
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_content_size:
+                    rejected = True
+                    if not response_started:
+                        await self._reject(413, "Request body too large", scope, receive, send)
+                    # Stop the application from reading any further
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message):
+            nonlocal response_started
+            if rejected:
+                # A 413 has already been sent; drop whatever the app responds with
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
+
+    async def _reject(self, status_code: int, detail: str, scope: Scope, receive: Receive, send: Send):
+        response = JSONResponse({"detail": detail}, status_code=status_code)
+        await response(scope, receive, send)
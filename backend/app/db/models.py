@@ -1,7 +1,7 @@
 """
 Database models for call analysis
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -110,6 +110,11 @@ class Analysis(Base):
 class UserConnection(Base):
     """Represents a bidirectional connection between two users."""
     __tablename__ = "user_connections"
+    __table_args__ = (
+        # Back lookups from either side of the connection, and pair checks
+        Index("ix_user_connections_user_id_connected_user_id", "user_id", "connected_user_id"),
+        Index("ix_user_connections_connected_user_id_user_id", "connected_user_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -135,6 +140,9 @@ class UserPresence(Base):
 class CallParticipant(Base):
     """Tracks all participants in a call (for group calls)."""
     __tablename__ = "call_participants"
+    __table_args__ = (
+        Index("ix_call_participants_call_id_user_id", "call_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     call_id = Column(Integer, ForeignKey("calls.id"), nullable=False)
@@ -163,6 +171,10 @@ class RecordingStatus(str, enum.Enum):
 class MeetingRecording(Base):
     """Stores external meeting recordings (Google Meet, Zoom, etc.)."""
     __tablename__ = "meeting_recordings"
+    __table_args__ = (
+        # Backs the per-user, newest-first recordings list
+        Index("ix_meeting_recordings_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
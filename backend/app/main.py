@@ -1,6 +1,8 @@
 """
 Operation One - FastAPI Backend
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -9,15 +11,32 @@ from app.api.calls import router as calls_router
 from app.api.analysis import router as analysis_router
 from app.api.users import router as users_router
 from app.api.recordings import router as recordings_router
+from app.core.config import settings
+from app.core.middleware import ContentSizeLimitMiddleware
+from app.services.local_transcription_service import local_transcription_service
 from app.websockets.call_handler import router as ws_router
 from app.websockets.presence_handler import router as presence_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pay the Whisper model load once at boot instead of on the first request
+    if settings.transcription_provider == "local":
+        local_transcription_service._get_model()
+    yield
+
+
 app = FastAPI(
     title="Operation One API",
     description="Backend for VoIP, Transcription, and Call Analysis",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Refuse oversized uploads before the body is buffered. Added before CORS so
+# CORS stays the outer layer and rejections still carry CORS headers.
+app.add_middleware(ContentSizeLimitMiddleware, max_content_size=settings.max_upload_bytes)
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -25,6 +44,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
 
 # Include routers
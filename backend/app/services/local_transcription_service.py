@@ -2,35 +2,66 @@
 Local Transcription Service using faster-whisper
 Optimized for CPU execution on Intel Mac with limited RAM.
 """
-from typing import Optional
-from faster_whisper import WhisperModel
+import asyncio
+import io
+import os
+from typing import AsyncIterator, Iterable, Optional
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+from app.core.config import settings
 
 
 class LocalTranscriptionService:
     """Service for audio transcription using faster-whisper on CPU."""
 
-    def __init__(self, model_size: str = "base", compute_type: str = "int8"):
+    def __init__(
+        self,
+        model_size: str = "base",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        beam_size: int = 1,
+        batch_size: int = 8,
+    ):
         """
         Initialize the transcription service.
         
         Args:
-            model_size: Whisper model size (tiny, base, small, medium, large).
+            model_size: Whisper model size (tiny, base, small, medium, large)
+                or path to a pre-converted CTranslate2 model directory.
             compute_type: Quantization type (int8 recommended for CPU).
+            cpu_threads: Number of inference threads (0 uses all cores).
+            num_workers: Number of parallel transcriptions per model.
+            beam_size: Decoder beam width (1 = greedy decoding).
+            batch_size: Number of VAD chunks decoded per batch (1 = sequential).
         """
         self.model_size = model_size
         self.compute_type = compute_type
+        self.cpu_threads = cpu_threads or os.cpu_count() or 0
+        self.num_workers = num_workers
+        self.beam_size = beam_size
+        self.batch_size = batch_size
         self._model: Optional[WhisperModel] = None
+        self._pipeline: Optional[BatchedInferencePipeline] = None
 
     def _get_model(self) -> WhisperModel:
-        """Lazy-load the model to avoid startup overhead."""
+        """Load the model once; called at startup so requests don't pay for it."""
         if self._model is None:
             self._model = WhisperModel(
                 self.model_size,
                 device="cpu",
                 compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads,
+                num_workers=self.num_workers,
             )
         return self._model
 
+    def _get_pipeline(self) -> BatchedInferencePipeline:
+        """Wrap the shared model in a batched pipeline (no extra weights are loaded)."""
+        if self._pipeline is None:
+            self._pipeline = BatchedInferencePipeline(model=self._get_model())
+        return self._pipeline
+
     async def transcribe_audio_file(self, audio_path: str) -> Optional[str]:
         """
         Transcribe an audio file using faster-whisper.
@@ -41,17 +72,54 @@ class LocalTranscriptionService:
         Returns:
             Transcription text.
         """
-        model = self._get_model()
+        # Inference is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self._transcribe, audio_path)
+
+    async def stream_audio_file(self, audio_path: str) -> AsyncIterator[str]:
+        """
+        Transcribe an audio file, yielding each segment's text as it is decoded.
         
-        segments, info = model.transcribe(
-            audio_path,
-            beam_size=5,
+        Args:
+            audio_path: Path to the audio file.
+        
+        Yields:
+            Segment text.
+        """
+        segments = iter(await asyncio.to_thread(self._segments, audio_path))
+        while True:
+            # Each step of the generator runs the decoder; keep it off the loop
+            segment = await asyncio.to_thread(next, segments, None)
+            if segment is None:
+                break
+            yield segment.text.strip()
+
+    def _segments(self, audio_path: str) -> Iterable:
+        """Start Whisper inference; segments are decoded lazily on iteration."""
+        options = dict(
+            beam_size=self.beam_size,
+            best_of=1,
+            condition_on_previous_text=False,
             vad_filter=True,  # Voice Activity Detection for cleaner segments
+            vad_parameters=dict(min_silence_duration_ms=500),
         )
         
-        # Combine all segments into full transcript
-        transcript = " ".join([segment.text.strip() for segment in segments])
-        return transcript
+        if self.batch_size > 1:
+            # Decode VAD-split chunks in batches through the encoder
+            segments, info = self._get_pipeline().transcribe(
+                audio_path, batch_size=self.batch_size, **options
+            )
+        else:
+            segments, info = self._get_model().transcribe(audio_path, **options)
+        return segments
+
+    def _transcribe(self, audio_path: str) -> str:
+        """Run Whisper inference synchronously."""
+        # Combine all segments into full transcript as they are produced
+        buffer = io.StringIO()
+        for segment in self._segments(audio_path):
+            buffer.write(segment.text.strip())
+            buffer.write(" ")
+        return buffer.getvalue().rstrip()
 
     async def transcribe_audio_bytes(
         self, audio_bytes: bytes, filename: str = "audio.webm"
@@ -66,9 +134,7 @@ class LocalTranscriptionService:
         Returns:
             Transcription text.
         """
-        import io
         import tempfile
-        import os
         
         # faster-whisper requires a file path, so write bytes to temp file
         suffix = os.path.splitext(filename)[1] or ".webm"
@@ -83,4 +149,11 @@ class LocalTranscriptionService:
 
 
 # Singleton instance
-local_transcription_service = LocalTranscriptionService()
+local_transcription_service = LocalTranscriptionService(
+    model_size=settings.whisper_model,
+    compute_type=settings.whisper_compute_type,
+    cpu_threads=settings.whisper_cpu_threads,
+    num_workers=settings.whisper_num_workers,
+    beam_size=settings.whisper_beam_size,
+    batch_size=settings.whisper_batch_size,
+)
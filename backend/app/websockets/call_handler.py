@@ -1,10 +1,10 @@
-import json
-import base64
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, status
+from sqlalchemy import exists, or_
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.db.models import Call, CallStatus, Transcript
+from app.db.models import Call, CallParticipant, CallStatus, Transcript
 from app.core.security import verify_jwt_token
 from app.websockets.connection_manager import manager
 from app.services.transcription_service import transcription_service
@@ -26,41 +26,43 @@ async def websocket_endpoint(
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
 
-    # Check if call exists and belongs to user
+    # Check that the call exists and the user takes part in it, in one query
     user_id = int(user_info.sub)
     db = SessionLocal()
     try:
-        call = db.query(Call).filter(Call.id == call_id).first()
-        if not call:
-            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-            return
-            
-        # Verify participation
-        is_participant = (
-            call.user_id == user_id or 
-            call.caller_id == user_id or 
-            call.callee_id == user_id
+        is_listed_participant = exists().where(
+            CallParticipant.call_id == call_id,
+            CallParticipant.user_id == user_id,
         )
-        
-        if not is_participant:
-            from app.db.models import CallParticipant
-            is_participant = db.query(CallParticipant).filter(
-                CallParticipant.call_id == call_id,
-                CallParticipant.user_id == user_id
-            ).first() is not None
-            
-        if not is_participant:
-            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-            return
+        is_participant = db.query(Call.id).filter(
+            Call.id == call_id,
+            or_(
+                Call.user_id == user_id,
+                Call.caller_id == user_id,
+                Call.callee_id == user_id,
+                is_listed_participant,
+            ),
+        ).first() is not None
     finally:
         db.close()
 
+    if not is_participant:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
     await manager.connect(call_id, websocket)
 
     try:
         while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            
+            # Binary frames carry raw audio; control messages are JSON text
+            if frame.get("bytes") is not None:
+                continue
+            
+            message = orjson.loads(frame["text"])
             
             # WebRTC Signaling Messages
             if message["type"] in ["offer", "answer", "ice_candidate"]:
@@ -1,21 +1,22 @@
-from typing import List, Dict
+import asyncio
+import orjson
+from typing import Dict, Set
 from fastapi import WebSocket
 
 
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: Dict[int, List[WebSocket]] = {}
+        self.active_connections: Dict[int, Set[WebSocket]] = {}
 
     async def connect(self, call_id: int, websocket: WebSocket):
         await websocket.accept()
         if call_id not in self.active_connections:
-            self.active_connections[call_id] = []
-        self.active_connections[call_id].append(websocket)
+            self.active_connections[call_id] = set()
+        self.active_connections[call_id].add(websocket)
 
     def disconnect(self, call_id: int, websocket: WebSocket):
         if call_id in self.active_connections:
-            if websocket in self.active_connections[call_id]:
-                self.active_connections[call_id].remove(websocket)
+            self.active_connections[call_id].discard(websocket)
             if not self.active_connections[call_id]:
                 del self.active_connections[call_id]
 
@@ -26,13 +27,20 @@ class ConnectionManager:
         await websocket.send_json(data)
 
     async def broadcast(self, call_id: int, message: dict, exclude_socket: WebSocket = None):
-        if call_id in self.active_connections:
-            for connection in self.active_connections[call_id]:
-                if connection != exclude_socket:
-                    try:
-                        await connection.send_json(message)
-                    except Exception:
-                        pass
+        connections = [
+            connection
+            for connection in self.active_connections.get(call_id, ())
+            if connection is not exclude_socket
+        ]
+        # Serialize once, then send to all participants concurrently
+        payload = orjson.dumps(message).decode()
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True,
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(call_id, connection)
 
 
 manager = ConnectionManager()
@@ -1,10 +1,14 @@
 """
 WebSocket handler for user presence tracking
 """
-import json
+import asyncio
+import time
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, status
+from sqlalchemy import case, event, func, or_
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.orm import Session
-from typing import Dict, Set
+from typing import Dict, Set, Tuple
 
 from app.db.session import get_db
 from app.db.models import User, UserPresence, UserConnection
@@ -13,6 +17,9 @@ from app.core.security import verify_jwt_token
 
 router = APIRouter()
 
+# How long a user's contact list is reused before it is re-read from the DB
+CONTACTS_CACHE_TTL_SECONDS = 300
+
 
 class PresenceManager:
     """Manages WebSocket connections for presence tracking."""
@@ -20,6 +27,8 @@ class PresenceManager:
     def __init__(self):
         # Map of user_id -> Set[WebSocket]
         self.active_connections: Dict[int, Set[WebSocket]] = {}
+        # Map of user_id -> (expires_at, contact user IDs)
+        self._contacts_cache: Dict[int, Tuple[float, Set[int]]] = {}
     
     async def connect(self, user_id: int, websocket: WebSocket, db: Session):
         """Connect a user and mark them as online."""
@@ -29,13 +38,9 @@ class PresenceManager:
             self.active_connections[user_id] = set()
         self.active_connections[user_id].add(websocket)
         
-        # Update or create presence record
-        presence = db.query(UserPresence).filter(UserPresence.user_id == user_id).first()
-        if presence:
-            presence.is_online = True
-        else:
-            presence = UserPresence(user_id=user_id, is_online=True)
-            db.add(presence)
+        # Update or create presence record; commit before broadcasting so the
+        # row lock isn't held while the sends are awaited
+        self._set_online(user_id, True, db)
         db.commit()
         
         # Notify all connections that this user is now online
@@ -50,32 +55,53 @@ class PresenceManager:
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
                 
-                # Update presence record
-                presence = db.query(UserPresence).filter(UserPresence.user_id == user_id).first()
-                if presence:
-                    presence.is_online = False
-                    db.commit()
+                # Update presence record; commit before broadcasting
+                self._set_online(user_id, False, db)
+                db.commit()
                 
                 # Notify all connections that this user is now offline
                 await self.broadcast_presence_update(user_id, False, db)
+                
+                # Contact lists are only needed while the user is connected
+                self.invalidate_contacts(user_id)
     
-    async def broadcast_presence_update(self, user_id: int, is_online: bool, db: Session):
-        """Notify all of a user's connections about their presence change."""
-        # Get all users connected to this user
-        connections_initiated = db.query(UserConnection).filter(
-            UserConnection.user_id == user_id
-        ).all()
+    def _set_online(self, user_id: int, is_online: bool, db: Session):
+        """Upsert the user's presence row in a single statement; the caller commits."""
+        stmt = insert(UserPresence).values(user_id=user_id, is_online=is_online)
+        stmt = stmt.on_duplicate_key_update(is_online=is_online, last_seen=func.now())
+        db.execute(stmt)
+    
+    def get_contact_ids(self, user_id: int, db: Session) -> Set[int]:
+        """Return the IDs of all users connected to a user, cached briefly."""
+        now = time.monotonic()
+        cached = self._contacts_cache.get(user_id)
+        if cached and cached[0] > now:
+            return cached[1]
         
-        connections_received = db.query(UserConnection).filter(
-            UserConnection.connected_user_id == user_id
+        # Get the other side of every connection involving this user in one query
+        other_user_id = case(
+            (UserConnection.user_id == user_id, UserConnection.connected_user_id),
+            else_=UserConnection.user_id,
+        )
+        rows = db.query(other_user_id).filter(
+            or_(
+                UserConnection.user_id == user_id,
+                UserConnection.connected_user_id == user_id,
+            )
         ).all()
+        contact_ids = {row[0] for row in rows}
         
-        # Collect unique connected user IDs
-        connected_user_ids = set()
-        for conn in connections_initiated:
-            connected_user_ids.add(conn.connected_user_id)
-        for conn in connections_received:
-            connected_user_ids.add(conn.user_id)
+        self._contacts_cache[user_id] = (now + CONTACTS_CACHE_TTL_SECONDS, contact_ids)
+        return contact_ids
+    
+    def invalidate_contacts(self, *user_ids: int):
+        """Drop cached contact lists, e.g. after a connection is added or removed."""
+        for user_id in user_ids:
+            self._contacts_cache.pop(user_id, None)
+    
+    async def broadcast_presence_update(self, user_id: int, is_online: bool, db: Session):
+        """Notify all of a user's connections about their presence change."""
+        connected_user_ids = self.get_contact_ids(user_id, db)
         
         # Send presence update to each connected user who is online
         message = {
@@ -84,14 +110,18 @@ class PresenceManager:
             "is_online": is_online
         }
         
-        for connected_user_id in connected_user_ids:
-            if connected_user_id in self.active_connections:
-                for ws in list(self.active_connections[connected_user_id]):
-                    try:
-                        await ws.send_json(message)
-                    except Exception:
-                        # Will be cleaned up on next disconnect
-                        pass
+        sockets = [
+            ws
+            for connected_user_id in connected_user_ids
+            if connected_user_id in self.active_connections
+            for ws in self.active_connections[connected_user_id]
+        ]
+        # Failed sends are ignored; dead sockets are cleaned up on disconnect
+        payload = orjson.dumps(message).decode()
+        await asyncio.gather(
+            *(ws.send_text(payload) for ws in sockets),
+            return_exceptions=True,
+        )
     
     async def send_heartbeat(self, websocket: WebSocket):
         """Send a heartbeat ping to keep connection alive."""
@@ -102,20 +132,23 @@ class PresenceManager:
 
     async def send_personal_message(self, user_id: int, message: dict):
         """Send a message to all of a user's active connections."""
-        success = False
-        if user_id in self.active_connections:
-            for ws in list(self.active_connections[user_id]):
-                try:
-                    await ws.send_json(message)
-                    success = True
-                except Exception:
-                    pass
-        return success
+        sockets = list(self.active_connections.get(user_id, ()))
+        results = await asyncio.gather(
+            *(ws.send_json(message) for ws in sockets),
+            return_exceptions=True,
+        )
+        return any(not isinstance(result, Exception) for result in results)
 
 
 presence_manager = PresenceManager()
 
 
+@event.listens_for(UserConnection, "after_insert")
+@event.listens_for(UserConnection, "after_delete")
+def _invalidate_contacts_cache(mapper, connection, target):
+    presence_manager.invalidate_contacts(target.user_id, target.connected_user_id)
+
+
 @router.websocket("/ws/presence")
 async def presence_websocket(
     websocket: WebSocket,
@@ -137,18 +170,19 @@ async def presence_websocket(
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
     
-    # Connect user - create a temporary session for this operation
+    # One session for the lifetime of the socket. Committing after each step
+    # ends the contact-lookup read so the pooled DB connection is released
+    # while the socket sits idle
     db = SessionLocal()
-    try:
-        await presence_manager.connect(user_id, websocket, db)
-    finally:
-        db.close()
     
     try:
+        await presence_manager.connect(user_id, websocket, db)
+        db.commit()
+        
         while True:
             # Wait for messages (mainly for heartbeat responses or manual disconnect)
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = orjson.loads(data)
             
             if message.get("type") == "heartbeat_response":
                 # Client acknowledged heartbeat
@@ -161,10 +195,11 @@ async def presence_websocket(
         pass
     except Exception as e:
         print(f"Presence WebSocket error for user {user_id}: {e}")
+        db.rollback()
     finally:
-        # Disconnect and mark offline - create another temp session
-        db = SessionLocal()
+        # Disconnect and mark offline
         try:
             await presence_manager.disconnect(user_id, websocket, db)
+            db.commit()
         finally:
             db.close()